@@ -4,7 +4,8 @@ import asyncio
 from typing import List, Dict, Any, Tuple
 from urllib.parse import urlparse, quote_plus
 import random
-from playwright.async_api import async_playwright
+import time
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError, Error as PlaywrightError
 import subprocess
 # --- Tunables --------------------------------------------------------------
 
@@ -26,6 +27,33 @@ MAX_SERP_PER_QUERY = 15     # keep this modest for speed
 TOP_N_RESULTS = 5           # final results per district
 VERIFY_TARGETS = True       # set this to false to skip verification step
 
+# browser page profiles used when loading bing result pages
+# - "full" loads everything like a normal visible browser
+# - "lean" runs headless, aborts non-essential resources/third-party hosts and waits on the result selector
+PAGE_PROFILES = {
+    "full": {
+        "headless": False,
+        "viewport": {"width": 1366, "height": 900},
+        "block_resources": False,
+        "goto_timeout": 45000,
+        "results_timeout": 30000,
+        "settle_timeout": 15000,
+    },
+    "lean": {
+        "headless": True,
+        "viewport": {"width": 800, "height": 600},
+        "block_resources": True,
+        "goto_timeout": 15000,
+        "results_timeout": 8000,
+        "settle_timeout": 5000,
+    },
+}
+PAGE_PROFILE = "full"
+COUNT_FULL_LOAD = False     # set this to true to let the page go network idle (up to settle_timeout) before the bytes are counted
+
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet", "texttrack", "eventsource", "websocket", "manifest", "other"}
+ALLOWED_HOSTS = ("bing.com",)   # requests to any other host are aborted in the lean profile
+
 # --- Helpers ---------------------------------------------------------------
 def any_keyword(text: str) -> bool:
     '''
@@ -83,16 +111,98 @@ def guess_aliases(district_name: str) -> List[str]:
     aliases_lower = {a.lower() for a in aliases}
     return list(aliases_lower)
 
+def is_allowed_host(url: str) -> bool:
+    """checks if the url belongs to one of the ALLOWED_HOSTS (or a subdomain of one)"""
+    host = urlparse(url).netloc.lower().split(":")[0]
+    return any(host == h or host.endswith("." + h) for h in ALLOWED_HOSTS)
+
 # --- search plans through bing  --------------------------------------------------
 
-async def fetch_bing_results(page, query: str, max_results: int = MAX_SERP_PER_QUERY) -> List[Dict[str, str]]:
+async def setup_page(page, stats: Dict[str, Any], profile: str = PAGE_PROFILE) -> Tuple[List[asyncio.Task], Any]:
+    """
+    prepares a page for loading bing results and hooks up the counters in stats
+    args:
+        page: playwright page
+        stats: dict
+            dict - counters filled in while the page loads: requests, blocked, bytes, size_errors
+        profile: str
+            str - key into PAGE_PROFILES
+    Returns (pending byte counting tasks, requestfinished listener), pass both to finish_page_stats before reading stats
+    """
+    settings = PAGE_PROFILES[profile]
+    stats.setdefault("requests", 0)
+    stats.setdefault("blocked", 0)
+    stats.setdefault("bytes", 0)
+    stats.setdefault("size_errors", 0)
+    pending: List[asyncio.Task] = []
+
+    if settings["block_resources"]:
+        async def block_non_essential(route):
+            req = route.request
+            if req.resource_type in BLOCKED_RESOURCE_TYPES or not is_allowed_host(req.url):
+                stats["blocked"] += 1
+                await route.abort()
+            else:
+                await route.continue_()
+
+        await page.route("**/*", block_non_essential)
+
+    async def count_bytes(req):
+        stats["requests"] += 1
+        try:
+            sizes = await req.sizes()
+            stats["bytes"] += sizes["requestHeadersSize"] + sizes["requestBodySize"] + sizes["responseHeadersSize"] + sizes["responseBodySize"]
+        except PlaywrightError:
+            # usually the page closed before the sizes came back, the bytes total is low by this many requests
+            stats["size_errors"] += 1
+
+    def on_request_finished(req):
+        pending.append(asyncio.ensure_future(count_bytes(req)))
+
+    page.on("requestfinished", on_request_finished)
+    return pending, on_request_finished
+
+async def finish_page_stats(page, stats: Dict[str, Any], pending: List[asyncio.Task], listener, profile: str = PAGE_PROFILE) -> Dict[str, Any]:
+    """
+    stops counting, waits on the byte counting tasks and closes the page
+    only the requests that finished up to now are counted unless COUNT_FULL_LOAD is set
+    Returns a snapshot of stats that will not change anymore
+    """
+    settings = PAGE_PROFILES[profile]
+    if COUNT_FULL_LOAD and stats.get("time_to_results_ms") is not None:
+        try:
+            await page.wait_for_load_state("networkidle", timeout=settings["settle_timeout"])
+        except PlaywrightTimeoutError:
+            print("page did not go idle, bytes are counted up to now")
+    page.remove_listener("requestfinished", listener)
+    await asyncio.gather(*pending)
+    await page.close()
+    return dict(stats)
+
+async def fetch_bing_results(page, query: str, max_results: int = MAX_SERP_PER_QUERY, stats: Dict[str, Any] = None, profile: str = PAGE_PROFILE) -> List[Dict[str, str]]:
     """
     Returns a list of {title, url, snippet, query}
+
+    if stats is passed in it gets the query and time_to_results_ms (None if no results showed up),
+    the page should already be set up with setup_page for the bytes/requests counters
     """
+    settings = PAGE_PROFILES[profile]
+    if stats is None:
+        stats = {}
+    stats["query"] = query
+    stats["time_to_results_ms"] = None
+
     print("fetching bing results for query:")
     q = f"https://www.bing.com/search?q={quote_plus(query)}&setlang=en-US"
-    await page.goto(q, wait_until="domcontentloaded", timeout=300000)
-    await page.wait_for_timeout(600)  # settle a bit
+    start = time.perf_counter()
+    try:
+        await page.goto(q, wait_until="domcontentloaded", timeout=settings["goto_timeout"])
+        # wait for the result blocks instead of sleeping
+        await page.wait_for_selector("li.b_algo", state="attached", timeout=settings["results_timeout"])
+    except PlaywrightTimeoutError:
+        print("no results loaded for query: " + query)
+        return []
+    stats["time_to_results_ms"] = round((time.perf_counter() - start) * 1000)
 
     # We target the result blocks: li.b_algo
     items_locator = page.locator("li.b_algo")
@@ -261,6 +371,8 @@ async def search_dip_for_district(district_name: str, state = None) -> List[Dict
 
         seen_urls = set()
         candidates: List[Dict[str, Any]] = []
+        query_stats: List[Dict[str, Any]] = []
+        settings = PAGE_PROFILES[PAGE_PROFILE]
 
         async def do_round(variant):
                 """
@@ -271,12 +383,14 @@ async def search_dip_for_district(district_name: str, state = None) -> List[Dict
                 """
                 rand_user_agent = random.choice(users) #prevent being blocked by bing
                 print("Using random user agent: " + rand_user_agent + "\n")
-                browser = await p.chromium.launch(headless=False, args=["--no-sandbox"])
+                browser = await p.chromium.launch(headless=settings["headless"], args=["--no-sandbox"])
                 context = await browser.new_context(
                     user_agent=(rand_user_agent),
-                    viewport={"width": 1366, "height": 900}
+                    viewport=settings["viewport"]
                 )
                 page = await context.new_page()
+                stats: Dict[str, Any] = {}
+                pending, listener = await setup_page(page, stats, PAGE_PROFILE)
 
                 # API-like HTTP context for quick verification
                 req_ctx = await p.request.new_context()
@@ -287,7 +401,10 @@ async def search_dip_for_district(district_name: str, state = None) -> List[Dict
                 else:
                     q = f'{district_name} {variant}'
 
-                serp = await fetch_bing_results(page, q, MAX_SERP_PER_QUERY)
+                serp = await fetch_bing_results(page, q, MAX_SERP_PER_QUERY, stats, PAGE_PROFILE)
+                stats = await finish_page_stats(page, stats, pending, listener, PAGE_PROFILE)
+                query_stats.append(stats)
+                print(f"query stats: {stats['bytes']} bytes over {stats['requests']} requests ({stats['size_errors']} not sized), {stats['blocked']} blocked, time to results {stats['time_to_results_ms']} ms\n")
                 for item in serp:
                     url = item["url"]
                     if url in seen_urls:
@@ -326,6 +443,9 @@ async def search_dip_for_district(district_name: str, state = None) -> List[Dict
         for v in SEARCH_VARIANTS:   
             await do_round(v)
 
+        total_bytes = sum(st["bytes"] for st in query_stats)
+        print(f"{PAGE_PROFILE} profile transferred {total_bytes} bytes over {len(query_stats)} queries")
+
         # De-dup by URL and keep best score
         best_by_url: Dict[str, Dict] = {}
         for c in candidates:
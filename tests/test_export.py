@@ -0,0 +1,59 @@
+import json
+import os
+
+import pytest
+from sqlalchemy import text
+
+# the schoolDigger module imported by the views needs these set
+os.environ.setdefault("SCHOOLDIGGER_APP_ID", "test")
+os.environ.setdefault("SCHOOLDIGGER_APP_KEY", "test")
+
+from website import create_app, db
+from website.models import School, Document
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}"})
+    with app.app_context():
+        db.session.add(School(id=1, nces_id="1700001", name="Test District", state="IL"))
+        db.session.commit()
+    return app
+
+def add_document(app, title, upload_date=None):
+    """adds a document to school 1, upload_date is stored as text the way func.now() stores it"""
+    with app.app_context():
+        if upload_date is None:
+            doc = Document(title=title, url="http://example.com/" + title, school_id=1)
+            db.session.add(doc)
+            db.session.commit()
+            return db.session.execute(text("SELECT upload_date FROM document WHERE id = :id"), {"id": doc.id}).scalar()
+        db.session.execute(
+            text("INSERT INTO document (title, url, upload_date, school_id) VALUES (:title, :url, :upload_date, 1)"),
+            {"title": title, "url": "http://example.com/" + title, "upload_date": upload_date},
+        )
+        db.session.commit()
+        return upload_date
+
+def exported_titles(client, query):
+    response = client.get("/export/documents.ndjson?" + query)
+    assert response.status_code == 200
+    return [json.loads(line)["title"] for line in response.get_data(as_text=True).splitlines() if line]
+
+def test_since_includes_rows_on_the_same_second(app):
+    stored = add_document(app, "dip")
+    since = stored.replace(" ", "T")
+    client = app.test_client()
+
+    assert exported_titles(client, "since=" + since) == ["dip"]
+    assert client.get("/export/schools.csv?since=" + since).get_data(as_text=True).count("\n") == 2
+
+def test_since_with_offset_is_compared_in_utc(app):
+    add_document(app, "dip", "2024-01-01 00:00:00")
+    client = app.test_client()
+
+    # 2023-12-31 22:00 UTC, before the upload
+    assert exported_titles(client, "since=2024-01-01T03:00:00%2B05:00") == ["dip"]
+    # 2024-01-01 01:00 UTC, after the upload
+    assert exported_titles(client, "since=2024-01-01T06:00:00%2B05:00") == []
+    assert exported_titles(client, "since=2024-01-01T00:00:00Z") == ["dip"]
@@ -5,15 +5,19 @@ from os import path
 db = SQLAlchemy()
 DB_NAME = "database.db"
 
-def create_app():
+def create_app(test_config=None):
     app = Flask(__name__)
     app.config['SECRET_KEY'] = 'chat is ts tuff or naw'
     app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{DB_NAME}'
+    if test_config:
+        app.config.update(test_config)
     db.init_app(app)
 
     from .views import views
+    from .export import export
 
     app.register_blueprint(views, url_prefix='/')
+    app.register_blueprint(export, url_prefix='/export')
 
     create_database(app)
 
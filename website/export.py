@@ -0,0 +1,163 @@
+from flask import Blueprint, Response, request, abort, stream_with_context
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
+from datetime import datetime, timezone
+from .models import School, Document, Tag
+from .views import filter_schools
+from . import db
+import csv
+import io
+import json
+import zlib
+
+
+export = Blueprint('export', __name__)
+
+CHUNK_SIZE = 1000   # rows pulled from the database (and flushed to the client) at a time
+
+SCHOOL_FIELDS = ["id", "nces_id", "name", "street", "county", "city", "state", "zip_code", "phone_number", "email", "website", "numberTotalSchools", "lowGrade", "highGrade", "tags"]
+DOCUMENT_FIELDS = ["id", "school_id", "title", "url", "upload_date", "tags"]
+TAG_FIELDS = ["id", "name", "description"]
+
+
+def parse_since(args):
+    """
+    returns the 'since' arg as a naive UTC datetime, None if it was not given (400 if it is not an ISO timestamp)
+
+    timestamps with an offset are converted to UTC since that is what func.now() stores
+    """
+    since = args.get('since')
+    if not since:
+        return None
+    try:
+        since = datetime.fromisoformat(since)
+    except ValueError:
+        abort(400, description="since must be an ISO 8601 timestamp")
+    if since.tzinfo is not None:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    return since
+
+def uploaded_since(since):
+    """
+    Document.upload_date >= since, compared as 'YYYY-MM-DD HH:MM:SS' text on both sides
+
+    func.now() stores no microseconds, so comparing against the bound datetime directly drops rows on the same second
+    """
+    return func.datetime(Document.upload_date) >= since.strftime("%Y-%m-%d %H:%M:%S")
+
+def school_rows(args):
+    """
+    filtered School query for the export, same filters as the search page
+
+    schools have no timestamp of their own so 'since' keeps the schools with a document uploaded after it
+    """
+    query = filter_schools(db.session.query(School), args)
+    since = parse_since(args)
+    if since:
+        query = query.filter(School.documents.any(uploaded_since(since)))
+    return query.options(selectinload(School.tags)).order_by(School.id)
+
+def document_rows(args):
+    """
+    filtered Document query for the export, search filters apply to the school the document belongs to
+
+    outer join so documents without a school are still exported when no school filter is given
+    """
+    query = filter_schools(db.session.query(Document).outerjoin(School, Document.school_id == School.id), args)
+    since = parse_since(args)
+    if since:
+        query = query.filter(uploaded_since(since))
+    return query.options(selectinload(Document.tags)).order_by(Document.id)
+
+def tag_rows(args):
+    """all tags, the search filters don't apply to them and tags have no timestamp so 'since' is rejected"""
+    if parse_since(args):
+        abort(400, description="since is not supported for the tags export")
+    return db.session.query(Tag).order_by(Tag.id)
+
+EXPORTS = {
+    "schools": (school_rows, SCHOOL_FIELDS),
+    "documents": (document_rows, DOCUMENT_FIELDS),
+    "tags": (tag_rows, TAG_FIELDS),
+}
+
+def row_values(obj, fields):
+    """returns a dict of the exported fields of a model, tags are flattened to their names"""
+    row = {}
+    for field in fields:
+        value = getattr(obj, field)
+        if field == "tags":
+            value = [tag.name for tag in value]
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        row[field] = value
+    return row
+
+def generate_csv(query, fields):
+    """yields the query as csv text, one chunk of CHUNK_SIZE rows at a time"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+
+    for i, obj in enumerate(query.yield_per(CHUNK_SIZE), 1):
+        row = row_values(obj, fields)
+        if "tags" in row:
+            row["tags"] = ";".join(row["tags"])
+        writer.writerow([row[field] for field in fields])
+        if i % CHUNK_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+
+    yield buffer.getvalue()
+
+def generate_ndjson(query, fields):
+    """yields the query as newline delimited json, one chunk of CHUNK_SIZE rows at a time"""
+    lines = []
+    for obj in query.yield_per(CHUNK_SIZE):
+        lines.append(json.dumps(row_values(obj, fields)) + "\n")
+        if len(lines) == CHUNK_SIZE:
+            yield "".join(lines)
+            lines = []
+
+    yield "".join(lines)
+
+def gzip_chunks(chunks):
+    """compresses the text chunks into a single gzip stream as they are generated"""
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+@export.route('/<dataset>.<fmt>')
+def export_data(dataset, fmt):
+    """
+    streams a full dataset (schools, documents or tags) as csv or ndjson
+
+    takes the same filters as the search page plus:
+        since: ISO timestamp, only rows changed after it
+        gzip: set to 1 to gzip the response
+    """
+    if dataset not in EXPORTS:
+        abort(404)
+
+    rows_for, fields = EXPORTS[dataset]
+    query = rows_for(request.args)
+
+    if fmt == "csv":
+        chunks = generate_csv(query, fields)
+        mimetype = "text/csv"
+    elif fmt == "ndjson":
+        chunks = generate_ndjson(query, fields)
+        mimetype = "application/x-ndjson"
+    else:
+        abort(404)
+
+    headers = {"Content-Disposition": f"attachment; filename={dataset}.{fmt}"}
+    if request.args.get('gzip') in ("1", "true"):
+        chunks = gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+
+    return Response(stream_with_context(chunks), mimetype=mimetype, headers=headers)
@@ -40,6 +40,7 @@ class Document(db.Model):
     url = db.Column(db.String(150))
     upload_date = db.Column(db.DateTime(timezone=True), default=func.now())
     school_id = db.Column(db.Integer, db.ForeignKey('school.id'))
+    tags = db.relationship('Tag', secondary=document_tag, backref='documents')
 
 class Tag(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -61,22 +61,18 @@ def district_detail(district_id):
     school = School.query.get_or_404(district_id)
     return render_template("district_detail.html", school=school)
 
-@views.route('/search')
-def search():
-    print("SEARCH")
-    city = request.args.get('city')
-    state = request.args.get('state')
-    zip_code = request.args.get('zip_code')
+def filter_schools(query, args):
+    """applies the search filters (query, city, state, zip_code, tags) from the request args to a School query"""
+    city = args.get('city')
+    state = args.get('state')
+    zip_code = args.get('zip_code')
 
-    tag_names = request.args.getlist('tags')
+    tag_names = args.getlist('tags')
     tags = db.session.query(Tag).filter(Tag.name.in_(tag_names)).all()
 
-    query = db.session.query(School)
-
-    search = request.args.get("query")
+    search = args.get("query")
 
     if(search and search != ""):
-        print("HERE")
         query = query.filter(
             School.name.ilike(f"%{search}%") | 
             School.street.ilike(f"%{search}%") | 
@@ -94,6 +90,13 @@ def search():
     if(tags):
         query = query.filter(School.tags.any(Tag.id.in_([tag.id for tag in tags])))
 
+    return query
+
+@views.route('/search')
+def search():
+    print("SEARCH")
+    query = filter_schools(db.session.query(School), request.args)
+
     results = query.all()
     
     return render_template('search_results.html', results=results)
\ No newline at end of file